@@ -1,8 +1,27 @@
 from dataclasses import dataclass
 from typing import List, Dict, Tuple, Optional
+from collections import defaultdict, OrderedDict
 from ortools.sat.python import cp_model
+import copy
+import hashlib
+import os
 import random
 
+# ---------- 솔버 튜닝 (환경변수로 조정) ----------
+# CP-SAT 포트폴리오는 8워커 이상에서 제대로 구성되므로 코어 수가 적어도 최소 8
+SOLVER_WORKERS = int(os.getenv("SOLVER_WORKERS", max(8, min(os.cpu_count() or 8, 16))))
+SOLVER_LINEARIZATION_LEVEL = int(os.getenv("SOLVER_LINEARIZATION_LEVEL", 1))
+SOLVER_PRESOLVE = os.getenv("SOLVER_PRESOLVE", "1") != "0"
+SOLVER_OPTIMIZE_WITH_CORE = os.getenv("SOLVER_OPTIMIZE_WITH_CORE", "1") != "0"
+SOLVER_CORE_MINIMIZATION_LEVEL = int(os.getenv("SOLVER_CORE_MINIMIZATION_LEVEL", 1))
+SOLVER_LOG = os.getenv("SOLVER_LOG", "0") == "1"
+
+# 입력이 구조적으로 같으면 모델 구축(파이썬 루프)을 건너뛰도록 프로세스 내 LRU 캐시
+MODEL_CACHE_SIZE = int(os.getenv("MODEL_CACHE_SIZE", 8))        # CpModel 객체는 크므로 작게
+SOLUTION_CACHE_SIZE = int(os.getenv("SOLUTION_CACHE_SIZE", 32))
+_MODEL_CACHE: "OrderedDict[str, tuple]" = OrderedDict()
+_SOLUTION_CACHE: "OrderedDict[str, dict]" = OrderedDict()
+
 # ---------- 데이터 모델 ----------
 @dataclass
 class Course:
@@ -56,8 +75,110 @@ class Request:
     soft: Soft
     randomize: bool = True  # 매 실행 랜덤 탐색
 
+# ---------- 랜덤 그리디 ----------
+def greedy_assign(courses: List[Course], rooms: List[Room], grid: Grid) -> List[dict]:
+    """방/강사 충돌만 피하며 랜덤 순서로 배정. 솔버 폴백 및 힌트 시드로 사용."""
+    # (day, block)별 빈 강의실 버킷 + 강사별 사용 중 시간 → 선형 스캔 없이 집합 연산으로 선택
+    free_by_day_block = {(d, b): set(r.id for r in rooms)
+                         for d in grid.days for b in range(1, grid.blocks_per_day + 1)}
+    open_slots = set(k for k, v in free_by_day_block.items() if v)
+    busy_inst = defaultdict(set)  # instructor_id -> {(day, block)}
+    assigns = []
+
+    # 코스 순서도 매번 랜덤 → “항상 랜덤” 요구 반영
+    random_courses = courses[:]
+    random.shuffle(random_courses)
+
+    for c in random_courses:
+        for s_idx in range(max(1, c.sessions_per_week)):
+            candidates = open_slots - busy_inst[c.instructor_id]
+            if not candidates:
+                break  # 남은 슬롯 부족하면 이 과목의 나머지 세션은 건너뜀
+            d, b = random.choice(list(candidates))
+            free_rooms = free_by_day_block[(d, b)]
+            r_id = random.choice(list(free_rooms))
+            assigns.append({
+                "course_id": c.id,
+                "session_index": s_idx,
+                "day": d,
+                "block": b,
+                "room_id": r_id
+            })
+            free_rooms.discard(r_id)
+            if not free_rooms:
+                open_slots.discard((d, b))
+            busy_inst[c.instructor_id].add((d, b))
+    return assigns
+
 # ---------- 솔버 ----------
+def _cache_key(courses: List[Course], rooms: List[Room], instructors: List[Instructor], req: Request) -> str:
+    """입력 전체(dataclass repr)의 해시."""
+    return hashlib.blake2b(repr((courses, rooms, instructors, req)).encode("utf-8")).hexdigest()
+
+def _lru_get(cache: OrderedDict, key: str):
+    value = cache.get(key)
+    if value is not None:
+        cache.move_to_end(key)
+    return value
+
+def _lru_put(cache: OrderedDict, key: str, value, maxsize: int):
+    if maxsize <= 0:
+        return
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > maxsize:
+        cache.popitem(last=False)
+
 def solve(courses: List[Course], rooms: List[Room], instructors: List[Instructor], req: Request):
+    # 캐시는 랜덤 탐색이 꺼져 있을 때만: 모델에는 섞인 슬롯/강의실 순서·탐색 순서·그리디 힌트가
+    # 들어가므로 재사용하면 매 실행 랜덤 탐색이 아니게 됨
+    key = None if req.randomize else _cache_key(courses, rooms, instructors, req)
+    if key is not None:
+        cached = _lru_get(_SOLUTION_CACHE, key)
+        if cached is not None:
+            return copy.deepcopy(cached)
+
+    built = _lru_get(_MODEL_CACHE, key) if key is not None else None
+    if built is None:
+        built = _build_model(courses, rooms, instructors, req)
+        if key is not None:
+            _lru_put(_MODEL_CACHE, key, built, MODEL_CACHE_SIZE)
+    model, vars_list, keys_list, has_objective = built
+
+    # 풀이 (모델은 Solve에서 변경되지 않으므로 그대로 재사용 가능)
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = 10.0
+    solver.parameters.num_workers = SOLVER_WORKERS
+    solver.parameters.cp_model_presolve = SOLVER_PRESOLVE
+    solver.parameters.linearization_level = SOLVER_LINEARIZATION_LEVEL
+    solver.parameters.log_search_progress = SOLVER_LOG
+    if has_objective and SOLVER_OPTIMIZE_WITH_CORE and SOLVER_WORKERS >= 8:
+        # 워커가 적으면 코어 기반 탐색만 돌다 첫 해를 못 찾으므로 포트폴리오가 충분할 때만
+        solver.parameters.optimize_with_core = True
+        solver.parameters.core_minimization_level = SOLVER_CORE_MINIMIZATION_LEVEL
+    if req.randomize:
+        solver.parameters.random_seed = random.randint(1, 1_000_000)
+
+    status = solver.Solve(model)
+    result = []
+    if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        for (c_id, s, d, b, r_id), var in zip(keys_list, vars_list):
+            if solver.Value(var) == 1:
+                result.append({
+                    "course_id": c_id,
+                    "session_index": s,
+                    "day": d,
+                    "block": b,
+                    "room_id": r_id
+                })
+    sol = {"status": int(status), "assignments": result}
+    # 시간 제한에 걸린 FEASIBLE은 다음 실행에서 더 좋아질 수 있으므로 확정 상태만 저장
+    if key is not None and status in (cp_model.OPTIMAL, cp_model.INFEASIBLE):
+        _lru_put(_SOLUTION_CACHE, key, copy.deepcopy(sol), SOLUTION_CACHE_SIZE)
+    return sol
+
+def _build_model(courses: List[Course], rooms: List[Room], instructors: List[Instructor], req: Request):
+    """CP-SAT 모델 구축. (model, vars_list, keys_list, 목적함수 유무) 반환."""
     model = cp_model.CpModel()
     grid = req.grid
 
@@ -73,99 +194,107 @@ def solve(courses: List[Course], rooms: List[Room], instructors: List[Instructor
         random.shuffle(slots)
         random.shuffle(rooms_order)
 
-    inst_by_id = {i.id: i for i in instructors}
+    # 결정변수 x[c, s, day, block, room] ∈ {0,1}
+    # 평탄 리스트(vars_list/keys_list) + 역인덱스를 한 번에 구축 → 제약마다 전체 키 공간 재탐색 없음
+    vars_list: List[cp_model.IntVar] = []
+    keys_list: List[tuple] = []
+    by_room_slot: Dict[tuple, List[int]] = defaultdict(list)       # (room, day, block) -> [idx]
+    by_inst_slot: Dict[tuple, List[int]] = defaultdict(list)       # (inst, day, block) -> [idx]
+    by_course_session: Dict[tuple, List[int]] = defaultdict(list)  # (course, session) -> [idx]
+    by_course_day: Dict[tuple, List[int]] = defaultdict(list)      # (course, day) -> [idx]
+    morning_vars: List[cp_model.IntVar] = []  # 오전(1~3교시) 시작 변수 — 생성 시 바로 분류
+
+    # 변수 생성 전 도메인 축소: 강사 불가 시간·수용 불가 강의실은 아예 변수를 만들지 않음
+    unavail = {i.id: set((d, b) for d, b in (i.unavailable or [])) for i in instructors}
+    feasible_rooms_by_size = {size: [r for r in rooms_order if r.capacity >= size]
+                              for size in set(c.size for c in courses)}
 
-    # 결정변수 X[c, s, day, block, room] ∈ {0,1}
-    X: Dict[tuple, cp_model.IntVar] = {}
     for c in courses:
+        inst_unavail = unavail.get(c.instructor_id, set())
+        c_rooms = feasible_rooms_by_size[c.size]
         for s in range(c.sessions_per_week):
             for (d, b) in slots:
                 if b + c.duration_blocks - 1 > grid.blocks_per_day:
                     continue
-                for r in rooms_order:
-                    if r.capacity < c.size:
-                        continue
-                    X[(c.id, s, d, b, r.id)] = model.NewBoolVar(f"x_{c.id}_{s}_{d}_{b}_{r.id}")
+                if (d, b) in inst_unavail:
+                    continue
+                for r in c_rooms:
+                    idx = len(vars_list)
+                    v = model.NewBoolVar(f"x_{c.id}_{s}_{d}_{b}_{r.id}")
+                    vars_list.append(v)
+                    if b <= 3:
+                        morning_vars.append(v)
+                    keys_list.append((c.id, s, d, b, r.id))
+                    by_room_slot[(r.id, d, b)].append(idx)
+                    by_inst_slot[(c.instructor_id, d, b)].append(idx)
+                    by_course_session[(c.id, s)].append(idx)
+                    by_course_day[(c.id, d)].append(idx)
 
-    # 1) 각 세션은 정확히 1자리
+    # 1) 각 세션은 정확히 1자리 (선형식 대신 전용 불리언 제약)
     for c in courses:
         for s in range(c.sessions_per_week):
-            model.Add(sum(X.get((c.id, s, d, b, r.id), 0) for (d, b) in slots for r in rooms_order) == 1)
+            model.AddExactlyOne([vars_list[i] for i in by_course_session.get((c.id, s), [])])
 
-    # 2) 같은 방·같은 시간 시작 ≤ 1
-    for r in rooms_order:
-        for d, b in slots:
-            starts = [X[(c.id, s, d, b, r.id)]
-                      for c in courses
-                      for s in range(c.sessions_per_week)
-                      if (c.id, s, d, b, r.id) in X]
-            if starts:
-                model.Add(sum(starts) <= 1)
+    # 2) 같은 방·같은 시간 시작 ≤ 1 (후보가 1개뿐인 칸은 항상 참이므로 생략)
+    for idxs in by_room_slot.values():
+        if len(idxs) > 1:
+            model.AddAtMostOne([vars_list[i] for i in idxs])
 
     # 3) 강사 중복 금지
-    for inst in instructors:
-        for d, b in slots:
-            vars_same = []
-            for c in courses:
-                if c.instructor_id != inst.id:
-                    continue
-                for s in range(c.sessions_per_week):
-                    for r in rooms_order:
-                        v = X.get((c.id, s, d, b, r.id))
-                        if v is not None:
-                            vars_same.append(v)
-            if vars_same:
-                model.Add(sum(vars_same) <= 1)
-
-    # 4) 강사 불가 시간
-    for c in courses:
-        unav = inst_by_id.get(c.instructor_id).unavailable if inst_by_id.get(c.instructor_id) else None
-        if not unav:
+    for idxs in by_inst_slot.values():
+        if len(idxs) > 1:
+            model.AddAtMostOne([vars_list[i] for i in idxs])
+
+    # 3-1) 대칭 제거: 수용인원·태그가 같은 강의실끼리는 맞바꿔도 같은 해이므로
+    #      같은 시간대에는 그룹 내 앞 순서(rooms_order 기준) 강의실부터 사용
+    room_groups: Dict[tuple, List[str]] = defaultdict(list)
+    for r in rooms_order:
+        room_groups[(r.capacity, tuple(sorted(r.tags or [])))].append(r.id)
+    for group in room_groups.values():
+        if len(group) < 2:
             continue
-        for (ud, ub) in unav:
-            for s in range(c.sessions_per_week):
-                for r in rooms_order:
-                    v = X.get((c.id, s, ud, ub, r.id))
-                    if v is not None:
-                        model.Add(v == 0)
-
-    # 5) 금요일 저녁 금지 (옵션)
+        for (d, b) in slots:
+            prev = None
+            for r_id in group:
+                cur = [vars_list[i] for i in by_room_slot.get((r_id, d, b), [])]
+                if prev and cur:
+                    # 방·시간당 시작은 최대 1개 → 합 자체가 '사용 여부' (used_cur → used_prev)
+                    model.Add(cp_model.LinearExpr.Sum(cur) <= cp_model.LinearExpr.Sum(prev))
+                prev = cur
+
+    # 4) 강사 불가 시간 — 변수 생성 단계에서 이미 제외됨
+
+    # 5) 금요일 저녁 금지 (옵션) — 금지 변수는 모아서 한 번에 0 고정
+    forbidden = []
     if req.hard.no_friday_evening:
         for c in courses:
-            for s in range(c.sessions_per_week):
-                for r in rooms_order:
-                    for b in range(1, grid.blocks_per_day + 1):
-                        if grid.is_evening(b):
-                            v = X.get((c.id, s, "FRI", b, r.id))
-                            if v is not None:
-                                model.Add(v == 0)
+            forbidden.extend(vars_list[i] for i in by_course_day.get((c.id, "FRI"), [])
+                             if grid.is_evening(keys_list[i][3]))
+    if forbidden:
+        model.AddBoolAnd([v.Not() for v in forbidden])
 
     # 6) 소프트: 오전 선호만 (compact 없음)
     penalties = []
-    if req.soft.prefer_morning:
-        for key, var in X.items():
-            _, _, _, b, _ = key
-            if b <= 3:
-                penalties.append(var * (-req.soft.weight))  # 보너스(음수 벌점)
+    if req.soft.prefer_morning and morning_vars:
+        penalties.append(-req.soft.weight * cp_model.LinearExpr.Sum(morning_vars))  # 보너스(음수 벌점)
     if penalties:
         model.Minimize(sum(penalties))
 
-    # 풀이
-    solver = cp_model.CpSolver()
-    solver.parameters.max_time_in_seconds = 10.0
-    if req.randomize:
-        solver.parameters.random_seed = random.randint(1, 1_000_000)
+    # 탐색 순서: 세션별로 (오전 선호 시) 이른 교시부터 시도
+    day_index = {d: k for k, d in enumerate(grid.days)}
+    strategy_vars = []
+    for idxs in by_course_session.values():
+        if req.soft.prefer_morning:
+            idxs = sorted(idxs, key=lambda i: (keys_list[i][3], day_index[keys_list[i][2]]))
+        strategy_vars.extend(vars_list[i] for i in idxs)
+    if strategy_vars:
+        model.AddDecisionStrategy(strategy_vars, cp_model.CHOOSE_FIRST, cp_model.SELECT_MAX_VALUE)
 
-    status = solver.Solve(model)
-    result = []
-    if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
-        for (c_id, s, d, b, r_id), var in X.items():
-            if solver.Value(var) == 1:
-                result.append({
-                    "course_id": c_id,
-                    "session_index": s,
-                    "day": d,
-                    "block": b,
-                    "room_id": r_id
-                })
-    return {"status": int(status), "assignments": result}
+    # 그리디 배정으로 웜스타트 힌트
+    idx_by_key = {k: i for i, k in enumerate(keys_list)}
+    for a in greedy_assign(courses, rooms_order, grid):
+        i = idx_by_key.get((a["course_id"], a["session_index"], a["day"], a["block"], a["room_id"]))
+        if i is not None:
+            model.AddHint(vars_list[i], 1)
+
+    return model, vars_list, keys_list, bool(penalties)
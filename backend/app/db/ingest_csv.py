@@ -3,6 +3,11 @@ import pandas as pd
 from sqlalchemy import create_engine
 from dotenv import load_dotenv
 
+try:
+    from .search_index import ensure_search_index
+except ImportError:  # 스크립트로 직접 실행할 때
+    from search_index import ensure_search_index
+
 load_dotenv()
 DATABASE_URL = os.getenv("DATABASE_URL")
 CSV_PATH = os.getenv("CSV_PATH", "courses_data.csv")
@@ -19,6 +24,9 @@ def main():
     df.columns = [c.strip() for c in df.columns]
     df.to_sql("courses", engine, if_exists="replace", index=False)
     print(f"Loaded {len(df)} rows into table 'courses'.")
+    # 테이블 교체로 사라진 검색 인덱스를 다시 생성
+    if ensure_search_index(engine, rebuild=True):
+        print("Rebuilt search index 'courses_fts'.")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,64 @@
+# backend/app/db/search_index.py
+import logging
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+
+def pick_name_col(cols):
+    """과목명 컬럼 자동 탐지."""
+    for k in ["교과목명", "과목명", "name", "NAME"]:
+        if k in cols:
+            return k
+    return cols[0] if cols else "교과목명"
+
+
+def ensure_search_index(engine, rebuild: bool = False) -> bool:
+    """과목명 검색 인덱스 준비. SQLite FTS5 사용 가능 여부 반환.
+
+    Postgres: pg_trgm GIN(ILIKE가 인덱스 사용), SQLite: FTS5 trigram.
+    서버 시작 시에는 없을 때만 만들고, 재구축(rebuild=True)은 courses 적재(교체) 직후에만.
+    실패하면(권한/확장 없음 등) 경고를 남기고 기존 LIKE 스캔으로 동작하도록 False.
+    """
+    dialect = engine.dialect.name
+    try:
+        with engine.begin() as c:
+            cols = list(c.execute(text("SELECT * FROM courses LIMIT 1")).keys())
+            name_col = pick_name_col(cols)
+            if dialect == "postgresql":
+                c.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+                c.execute(text(f'''
+                    CREATE INDEX IF NOT EXISTS courses_name_trgm
+                    ON courses USING gin ((CAST("{name_col}" AS TEXT)) gin_trgm_ops)
+                '''))
+            elif dialect == "sqlite":
+                if not rebuild and _has_fts_table(c):
+                    return True
+                # courses는 CSV 적재 시 통째로 교체되므로(rowid 변경) 트리거 대신 적재 시점에 다시 만듦
+                if rebuild:
+                    c.execute(text("DROP TABLE IF EXISTS courses_fts"))
+                c.execute(text(f'''
+                    CREATE VIRTUAL TABLE IF NOT EXISTS courses_fts
+                    USING fts5("{name_col}", content='courses', content_rowid='rowid', tokenize='trigram')
+                '''))
+                c.execute(text("INSERT INTO courses_fts(courses_fts) VALUES('rebuild')"))
+                return True
+    except Exception as e:
+        # 여러 워커가 동시에 시작해 다른 워커가 먼저 만든 경우(잠금 충돌 등)면 그 인덱스를 사용
+        if dialect == "sqlite" and not rebuild:
+            try:
+                with engine.connect() as c:
+                    if _has_fts_table(c):
+                        return True
+            except Exception:
+                pass
+        logger.warning("검색 인덱스 준비 실패, LIKE 검색으로 동작: %s: %s", e.__class__.__name__, e)
+    return False
+
+
+def _has_fts_table(conn) -> bool:
+    row = conn.execute(text(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'courses_fts'"
+    )).first()
+    return row is not None
@@ -0,0 +1,25 @@
+# backend/app/factory.py
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from fastapi.staticfiles import StaticFiles
+
+FRONT_DIR = Path(__file__).resolve().parents[2] / "frontend"
+
+
+def create_app(lifespan=None) -> FastAPI:
+    """공통 미들웨어·정적 파일 마운트가 적용된 FastAPI 앱 생성."""
+    # 큰 응답(/schedule, /search)의 JSON 직렬화를 orjson으로
+    app = FastAPI(title="Courses API", default_response_class=ORJSONResponse, lifespan=lifespan)
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    app.mount("/app", StaticFiles(directory=str(FRONT_DIR), html=True), name="static")
+    return app
@@ -1,17 +1,26 @@
 # backend/app/main.py
+import asyncio
 import os
-import re
 import random
+import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from itertools import chain
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 
+import numpy as np
+import orjson
 import pandas as pd
 from dotenv import load_dotenv
-from fastapi import FastAPI, Query
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import JSONResponse
-from sqlalchemy import create_engine, text
+from fastapi import Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import create_engine, make_url, text
 from pydantic import BaseModel
 
 # ── 내부 모듈 (상대 경로) ─────────────────────────────────────────────
@@ -24,8 +33,10 @@ except Exception:
     def rank_courses_ko(prefs: str, courses: list, topk: int = 5):
         return courses[:topk]
 
+from .factory import create_app
+from .db.search_index import pick_name_col, ensure_search_index
 from .core.scheduler import (
-    solve, Course, Room, Instructor, Grid, Hard, Soft, Request
+    solve, greedy_assign, Course, Room, Instructor, Grid, Hard, Soft, Request
 )
 
 # ───────────────────────── Env & DB ─────────────────────────
@@ -41,21 +52,64 @@ if DATABASE_URL.startswith("sqlite:///./"):
     db_file = Path(__file__).resolve().parents[2] / DATABASE_URL.replace("sqlite:///./", "")
     DATABASE_URL = f"sqlite:///{db_file.as_posix()}"
 
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+# 풀 크기는 서버형 DB에만 (SQLite 메모리 DB 풀은 pool_size 인자를 받지 않음)
+_pool_kwargs: Dict[str, Any] = {}
+if make_url(DATABASE_URL).get_backend_name() != "sqlite":
+    _pool_kwargs = dict(pool_size=20, max_overflow=10, pool_recycle=1800)
+engine = create_engine(DATABASE_URL, pool_pre_ping=True, query_cache_size=1200, **_pool_kwargs)
 DB_DIALECT = engine.dialect.name  # 'postgresql' / 'sqlite' 등
 
+# OR-Tools 풀이 전용 프로세스 풀: 모델 구축(파이썬)이 이벤트 루프/GIL을 점유하지 않도록
+# 여러 사용자의 풀이가 줄 서지 않게 동시 실행 수는 최소 min(코어 수, 4)
+SOLVE_PROCESSES = int(os.getenv("SOLVE_PROCESSES", max(1, min(os.cpu_count() or 1, 4))))
+
+def _new_process_pool() -> ProcessPoolExecutor:
+    # 자식마다 난수 상태를 새로 시드(fork 직후 같은 상태로 시작하지 않게)
+    return ProcessPoolExecutor(max_workers=SOLVE_PROCESSES, initializer=random.seed)
+
+PROCESS_POOL = _new_process_pool()
+_PROCESS_POOL_LOCK = threading.Lock()
+
+def _replace_broken_pool(broken: ProcessPoolExecutor) -> ProcessPoolExecutor:
+    """자식 프로세스가 죽어(OOM kill 등) 못 쓰게 된 풀을 새 풀로 교체. 동시 요청은 한 번만 교체."""
+    global PROCESS_POOL
+    with _PROCESS_POOL_LOCK:
+        if PROCESS_POOL is broken:
+            broken.shutdown(wait=False, cancel_futures=True)
+            PROCESS_POOL = _new_process_pool()
+        return PROCESS_POOL
+
+async def _solve_in_pool(*args):
+    """프로세스 풀에서 solve 실행. 풀이 깨져 있으면 새로 만들어 한 번만 재시도."""
+    loop = asyncio.get_running_loop()
+    pool = PROCESS_POOL
+    try:
+        return await loop.run_in_executor(pool, solve, *args)
+    except BrokenProcessPool:
+        pool = _replace_broken_pool(pool)
+        return await loop.run_in_executor(pool, solve, *args)
+
+# courses 테이블 캐시: 버전(행 수 + 최대 행 식별자)과 TTL 구간이 같으면 재조회하지 않음
+COURSES_CACHE_TTL = int(os.getenv("COURSES_CACHE_TTL", 60))
+if DB_DIALECT == "sqlite":
+    COURSES_VERSION_SQL = "SELECT COUNT(*), MAX(rowid) FROM courses"
+elif DB_DIALECT == "postgresql":
+    COURSES_VERSION_SQL = "SELECT COUNT(*), MAX(xmin::text::bigint) FROM courses"
+else:
+    COURSES_VERSION_SQL = "SELECT COUNT(*) FROM courses"
+
 # ───────────────────────── FastAPI ─────────────────────────
-app = FastAPI(title="Courses API")
+# 검색 인덱스는 시작 시 한 번만 준비 (SQLite FTS5 사용 가능 여부를 기억)
+_search_index_state: Dict[str, Any] = {"fts": False}
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+@asynccontextmanager
+async def _lifespan(app):
+    _search_index_state["fts"] = await run_in_threadpool(ensure_search_index, engine)
+    yield
+    # 종료 시 풀이 프로세스 정리 (대기 중인 작업은 취소)
+    PROCESS_POOL.shutdown(wait=False, cancel_futures=True)
 
-FRONT_DIR = Path(__file__).resolve().parents[2] / "frontend"
-app.mount("/app", StaticFiles(directory=str(FRONT_DIR), html=True), name="static")
+app = create_app(lifespan=_lifespan)
 
 # ───────────────────────── Schemas ─────────────────────────
 class SummaryIn(BaseModel):
@@ -73,29 +127,101 @@ class ScheduleIn(BaseModel):
     priorityWeight: int = 1
     natural: str = ""
     noFridayEvening: bool = False  # 하드 제약(체크박스 연결용)
+    randomize: bool = True  # False면 같은 입력의 CP-SAT 모델을 재사용하고, 확정(OPTIMAL) 해는 캐시에서 바로 반환
 
 # ───────────────────────── 공통 유틸 ─────────────────────────
-def _to_int(x, default=0):
-    """문자/콤마/NaN 섞여 있어도 안전하게 int로."""
-    if x is None:
-        return default
-    if isinstance(x, int):
-        return x
-    s = str(x).strip()
-    if s == "" or s.lower() == "nan":
-        return default
-    s = re.sub(r"[^0-9\-]", "", s)
+_DIGITS_RE = re.compile(r"[^0-9\-]")
+
+def _blank_to_na(v: pd.Series) -> pd.Series:
+    """문자열 컬럼의 빈 값("", 공백)을 결측으로. 숫자 컬럼은 dtype 그대로 둠."""
+    if pd.api.types.is_numeric_dtype(v.dtype):
+        return v
+    return v.where(v.notna() & (v.astype(str).str.strip() != ""))
+
+def _coalesce_cols(df: pd.DataFrame, cols: List[str], fallback=None) -> pd.Series:
+    """후보 컬럼 중 처음으로 값이 있는 것을 행 단위로 선택(벡터 연산). 모두 비면 fallback."""
+    present = [col for col in cols if col in df.columns]
+    if not present:
+        out = pd.Series(None, index=df.index, dtype=object)
+    else:
+        # 후보가 하나면 원래 dtype 유지 → _to_int_series의 숫자 빠른 경로를 탈 수 있음
+        out = _blank_to_na(df[present[0]])
+        for col in present[1:]:
+            out = out.combine_first(_blank_to_na(df[col]))
+    return out if fallback is None else out.fillna(fallback)
+
+def _to_int_series(s: pd.Series, default: int) -> pd.Series:
+    """문자/콤마/NaN 섞인 컬럼을 안전하게 int로. 컬럼 dtype을 한 번 보고 변환 경로를 고름."""
+    dt = s.dtype
+    if pd.api.types.is_bool_dtype(dt):
+        return s.fillna(default).astype(int)
+    if pd.api.types.is_integer_dtype(dt):
+        return s.fillna(default).astype(int) if s.hasnans else s.astype(int)
+    if pd.api.types.is_float_dtype(dt):
+        return s.where(np.isfinite(s)).fillna(default).astype(int)
+    # object/문자열: 숫자로 바로 읽히는 값은 그대로, 나머지만 숫자 외 문자 제거
+    num = pd.to_numeric(s, errors="coerce")
+    rest = num.isna() & s.notna()
+    if rest.any():
+        cleaned = s[rest].astype(str).str.replace(_DIGITS_RE, "", regex=True)
+        num[rest] = pd.to_numeric(cleaned, errors="coerce")
+    return num.where(np.isfinite(num)).fillna(default).astype(int)
+
+def _course_id_series(df: pd.DataFrame) -> pd.Series:
+    """교과목코드 → 코드 → C{행번호} 순으로 과목 ID 결정."""
+    fallback = pd.Series([f"C{i+1}" for i in df.index], index=df.index)
+    return _coalesce_cols(df, ["교과목코드", "코드"], fallback).astype(str)
+
+def fetch_records(sql: str, **params) -> List[Dict[str, Any]]:
+    """쿼리 결과를 DataFrame 없이 바로 dict 리스트로."""
+    with engine.connect() as c:
+        res = c.execute(text(sql), params)
+        cols = list(res.keys())
+        return [dict(zip(cols, row)) for row in res.fetchall()]
+
+STREAM_BATCH = 500  # 스트리밍 시 서버 측 커서에서 한 번에 가져오는 행 수
+
+def _stream_json_rows(conn, cols, rows, head: bytes, tail: bytes, drop=()):
+    """행을 JSON 배열 조각으로 흘려보냄(메모리는 배치 크기만큼). 끝나면 커넥션 반납."""
     try:
-        return int(s) if s not in ("", "-") else default
-    except Exception:
-        return default
+        keep = [i for i, k in enumerate(cols) if k not in drop]
+        names = [cols[i] for i in keep]
+        buf = bytearray(head)
+        sep = b""
+        for n, row in enumerate(rows, 1):
+            buf += sep + orjson.dumps(dict(zip(names, (row[i] for i in keep))),
+                                      default=str, option=orjson.OPT_SERIALIZE_NUMPY)
+            sep = b","
+            if n % STREAM_BATCH == 0:
+                yield bytes(buf)
+                buf.clear()
+        buf += tail
+        yield bytes(buf)
+    finally:
+        conn.close()
+
+# ───────────────────────── 과목 캐시 ─────────────────────────
+def _courses_version() -> tuple:
+    """courses 테이블 버전 스탬프(저렴한 집계 쿼리) + TTL 구간."""
+    with engine.connect() as c:
+        row = c.execute(text(COURSES_VERSION_SQL)).fetchone()
+    return tuple(row), int(time.time() // max(1, COURSES_CACHE_TTL))
+
+@lru_cache(maxsize=1)
+def _load_courses_records(version: tuple) -> List[Dict[str, Any]]:
+    """SELECT * FROM courses 결과(dict 리스트). 공유되므로 수정 금지."""
+    return fetch_records("SELECT * FROM courses")
 
-def _pick_name_col(cols):
-    """과목명 컬럼 자동 탐지."""
-    for k in ["교과목명", "과목명", "name", "NAME"]:
-        if k in cols:
-            return k
-    return cols[0] if cols else "교과목명"
+@lru_cache(maxsize=1)
+def _load_courses_df(version: tuple) -> pd.DataFrame:
+    """컬럼 단위 변환용 DataFrame(캐시된 레코드에서 생성). 공유되므로 수정 금지."""
+    return pd.DataFrame.from_records(_load_courses_records(version))
+
+@lru_cache(maxsize=1)
+def _courses_by_cid(version: tuple) -> Dict[str, dict]:
+    """과목 ID → 원본 행(dict). 값은 공유되므로 수정 금지."""
+    df = _load_courses_df(version)
+    return dict(zip(_course_id_series(df), _load_courses_records(version)))
 
 # ───────────────────────── Endpoints ─────────────────────────
 @app.get("/health")
@@ -104,54 +230,73 @@ def health():
 
 @app.get("/courses")
 def courses(limit: int = 20, offset: int = 0):
-    with engine.connect() as c:
+    # 서버 측 커서로 스트리밍 → limit이 커도 DataFrame/리스트/JSON 3중 적재 없음
+    conn = engine.connect().execution_options(stream_results=True, yield_per=STREAM_BATCH)
+    try:
         # LIMIT/OFFSET은 정수 인라인(일부 드라이버 파라미터 바인딩 이슈 회피)
-        df = pd.read_sql(text(f"SELECT * FROM courses LIMIT {int(limit)} OFFSET {int(offset)}"), c)
-    return df.to_dict(orient="records")
+        res = conn.execute(text(f"SELECT * FROM courses LIMIT {int(limit)} OFFSET {int(offset)}"))
+    except Exception:
+        conn.close()
+        raise
+    return StreamingResponse(_stream_json_rows(conn, list(res.keys()), res, b"[", b"]"),
+                             media_type="application/json")
 
 @app.get("/search")
 def search(q: str = Query(..., min_length=1), limit: int = 100, offset: int = 0):
+    q = (q or "").strip()
+    if not q:
+        return {"total": 0, "results": []}
+
+    conn = engine.connect()
     try:
-        q = (q or "").strip()
-        if not q:
-            return {"total": 0, "results": []}
-
-        with engine.connect() as c:
-            cols = pd.read_sql(text("SELECT * FROM courses LIMIT 1"), c).columns.tolist()
-            name_col = _pick_name_col(cols)
-
-            if DB_DIALECT == "postgresql":
-                sql = text(f'''
-                    SELECT * FROM courses
-                    WHERE CAST("{name_col}" AS TEXT) ILIKE :kw
-                    ORDER BY 1
-                    LIMIT {int(limit)} OFFSET {int(offset)}
-                ''')
-                cnt_sql = text(f'''
-                    SELECT COUNT(*) FROM courses
-                    WHERE CAST("{name_col}" AS TEXT) ILIKE :kw
-                ''')
-                params = {"kw": f"%{q}%"}
+        cols = list(conn.execute(text("SELECT * FROM courses LIMIT 1")).keys())
+        name_col = pick_name_col(cols)
+        use_fts = _search_index_state["fts"]
+
+        src, cols_sql = "courses", "*"
+        if DB_DIALECT == "postgresql":
+            where = f'CAST("{name_col}" AS TEXT) ILIKE :kw'
+            params = {"kw": f"%{q}%"}
+        elif use_fts and len(q) >= 3:
+            # FTS5 trigram은 3글자 이상부터 인덱스 탐색 가능
+            src = "courses_fts f JOIN courses c ON c.rowid = f.rowid"
+            cols_sql = "c.*"
+            where = "courses_fts MATCH :kw"
+            params = {"kw": '"' + q.replace('"', '""') + '"'}
+        else:
+            # SQLite 등
+            where = f'LOWER(CAST("{name_col}" AS TEXT)) LIKE :kw'
+            params = {"kw": f"%{q.lower()}%"}
+
+        # 전체 건수는 윈도우 함수로 같은 스캔에서 함께 계산 (쿼리 1회)
+        sql = text(f'''
+            SELECT {cols_sql}, COUNT(*) OVER () AS _total FROM {src}
+            WHERE {where}
+            ORDER BY 1
+            LIMIT {int(limit)} OFFSET {int(offset)}
+        ''')
+        # 결과 행은 서버 측 커서로 스트리밍 (첫 행에서 total 확보)
+        res = conn.execution_options(stream_results=True, yield_per=STREAM_BATCH).execute(sql, params)
+        res_cols = list(res.keys())
+        first = res.fetchone()
+        if first is not None:
+            total = int(first._mapping["_total"])
+            rows = chain([first], res)
+        else:
+            res.close()
+            rows = []
+            if offset > 0:
+                # 페이지 범위를 벗어나면 행이 없으므로 건수만 따로 조회
+                total = conn.execute(text(f"SELECT COUNT(*) FROM {src} WHERE {where}"), params).scalar() or 0
             else:
-                # SQLite 등
-                sql = text(f'''
-                    SELECT * FROM courses
-                    WHERE LOWER(CAST("{name_col}" AS TEXT)) LIKE :kw
-                    ORDER BY 1
-                    LIMIT {int(limit)} OFFSET {int(offset)}
-                ''')
-                cnt_sql = text(f'''
-                    SELECT COUNT(*) FROM courses
-                    WHERE LOWER(CAST("{name_col}" AS TEXT)) LIKE :kw
-                ''')
-                params = {"kw": f"%{q.lower()}%"}
-
-            df = pd.read_sql(sql, c, params=params)
-            total = c.execute(cnt_sql, params).scalar() or 0
-
-        return {"total": int(total), "results": df.to_dict(orient="records")}
+                total = 0
     except Exception as e:
-        return JSONResponse(status_code=500, content={"detail": f"/search 실패: {e.__class__.__name__}: {e}"})
+        conn.close()
+        return ORJSONResponse(status_code=500, content={"detail": f"/search 실패: {e.__class__.__name__}: {e}"})
+
+    head = b'{"total":' + str(int(total)).encode() + b',"results":['
+    return StreamingResponse(_stream_json_rows(conn, res_cols, rows, head, b"]}", drop=("_total",)),
+                             media_type="application/json")
 
 @app.post("/gemini/summary")
 def gemini_summary(body: SummaryIn):
@@ -160,132 +305,106 @@ def gemini_summary(body: SummaryIn):
 @app.post("/gemini/recommend")
 def gemini_recommend(body: RecommendIn):
     topk = max(1, min(body.limit, 10))
-    with engine.connect() as c:
-        df = pd.read_sql(text("SELECT * FROM courses"), c)
-    courses = df.to_dict(orient="records")
+    courses = _load_courses_records(_courses_version())
     res = rank_courses_ko(body.preferences, courses, topk=topk)
     return {"result": res}
 
+def _prepare_schedule(body: ScheduleIn):
+    """과목 로드 → 모델 변환 → 강의실/그리드 구성 (블로킹, 스레드풀에서 실행)"""
+    # 1) 과목 로드 (버전이 같으면 캐시 재사용)
+    version = _courses_version()
+    df = _load_courses_df(version)
+
+    # 2) DB → 모델 변환
+    courses_m: List[Course] = []
+    inst_map: Dict[str, Instructor] = {}
+
+    cid_s  = _course_id_series(df)
+    name_s = _coalesce_cols(df, ["교과목명", "과목"], cid_s).astype(str)
+    size_s = _to_int_series(_coalesce_cols(df, ["수강인원"]), 30)
+    sess_s = _to_int_series(_coalesce_cols(df, ["수업주수", "수업주수(회)"]), 1)
+    prof_s = _coalesce_cols(df, ["강좌대표교수", "교수"], "교수미정").astype(str)
+
+    cols_df = pd.DataFrame({"cid": cid_s, "name": name_s, "size": size_s,
+                            "sess": sess_s, "prof": prof_s})
+    for cid, name, size, sess, prof in cols_df.itertuples(index=False):
+        courses_m.append(Course(
+            id=cid, name=name, size=size,
+            sessions_per_week=max(1, sess),
+            duration_blocks=1,
+            instructor_id=prof
+        ))
+        if prof not in inst_map:
+            inst_map[prof] = Instructor(id=prof, name=prof, unavailable=[])
+
+    instructors = list(inst_map.values())
+
+    # 3) 강의실 구성 (없으면 기본)
+    room_ids = []
+    if "강의실" in df.columns:
+        room_ids = sorted(set(str(x).strip() for x in df["강의실"].dropna().tolist() if str(x).strip()))
+    if not room_ids:
+        room_ids = ["R101", "R102"]
+    rooms = [Room(id=r, name=r, capacity=120 if i == 0 else 80, tags=[]) for i, r in enumerate(room_ids)]
+
+    # 4) 그리드/제약 (오전 선호만 사용)
+    grid = Grid(days=[d.upper()[:3] for d in body.days],
+                blocks_per_day=body.periodsPerDay,
+                block_minutes=body.blockMinutes)
+    hard = Hard(no_friday_evening=bool(body.noFridayEvening))
+    soft = Soft(prefer_morning=bool(body.preferMorning), weight=int(body.priorityWeight))
+    req = Request(grid=grid, hard=hard, soft=soft, randomize=bool(body.randomize))
+    return version, courses_m, rooms, instructors, req
+
+
+def _finish_schedule(version, courses_m, rooms, instructors, grid, sol):
+    """폴백 배정 + 프론트용 응답 구성 (블로킹, 스레드풀에서 실행)"""
+    assigns = sol.get("assignments", [])
+
+    # ── 폴백: 해가 없으면 랜덤 그리디로 항상 배정 ──────────────────
+    if not assigns:
+        assigns = greedy_assign(courses_m, rooms, grid)
+
+    # 6) 프론트용 schedule 생성
+    by_cid = _courses_by_cid(version)
+    schedule_rows = []
+    for a in assigns:
+        base = by_cid.get(str(a["course_id"]), {})
+        schedule_rows.append({
+            **base,
+            "요일": a["day"],
+            "slot": f"P{a['block']}",
+            "강의실": a["room_id"],
+        })
+
+    return {
+        "message": "배정 완료",
+        "summary": {
+            "courses": len(courses_m),
+            "rooms": len(rooms),
+            "instructors": len(instructors),
+            "days": grid.days,
+            "blocks_per_day": grid.blocks_per_day,
+            "block_minutes": grid.block_minutes
+        },
+        "solution": {"assignments": assigns},
+        "schedule": schedule_rows,
+    }
+
+
 @app.post("/schedule")
-def schedule(body: ScheduleIn):
+async def schedule(body: ScheduleIn):
     try:
-        # 1) 과목 로드
-        with engine.connect() as c:
-            df = pd.read_sql(text("SELECT * FROM courses"), c)
-
-        # 2) DB → 모델 변환
-        courses_m: List[Course] = []
-        inst_map: Dict[str, Instructor] = {}
-
-        for i, row in df.iterrows():
-            cid  = str(row.get("교과목코드") or row.get("코드") or f"C{i+1}")
-            name = str(row.get("교과목명") or row.get("과목") or cid)
-            size = _to_int(row.get("수강인원"), 30)
-            sess = _to_int(row.get("수업주수") or row.get("수업주수(회)"), 1)
-            prof = str(row.get("강좌대표교수") or row.get("교수") or "교수미정")
-
-            courses_m.append(Course(
-                id=cid, name=name, size=size,
-                sessions_per_week=max(1, sess),
-                duration_blocks=1,
-                instructor_id=prof
-            ))
-            if prof not in inst_map:
-                inst_map[prof] = Instructor(id=prof, name=prof, unavailable=[])
-
-        instructors = list(inst_map.values())
-
-        # 3) 강의실 구성 (없으면 기본)
-        room_ids = []
-        if "강의실" in df.columns:
-            room_ids = sorted(set(str(x).strip() for x in df["강의실"].dropna().tolist() if str(x).strip()))
-        if not room_ids:
-            room_ids = ["R101", "R102"]
-        rooms = [Room(id=r, name=r, capacity=120 if i == 0 else 80, tags=[]) for i, r in enumerate(room_ids)]
-
-        # 4) 그리드/제약 (오전 선호만 사용)
-        grid = Grid(days=[d.upper()[:3] for d in body.days],
-                    blocks_per_day=body.periodsPerDay,
-                    block_minutes=body.blockMinutes)
-        hard = Hard(no_friday_evening=bool(body.noFridayEvening))
-        soft = Soft(prefer_morning=bool(body.preferMorning), weight=int(body.priorityWeight))
-        req = Request(grid=grid, hard=hard, soft=soft, randomize=True)
+        version, courses_m, rooms, instructors, req = await run_in_threadpool(_prepare_schedule, body)
 
         # 5) OR-Tools 풀이
-        sol = solve(courses_m, rooms, instructors, req)
-        assigns = sol.get("assignments", [])
-
-        # ── 폴백: 해가 없으면 랜덤 그리디로 항상 배정 ──────────────────
-        if not assigns:
-            # 모든 (day, block, room) 슬롯 생성 후 셔플
-            all_slots = []
-            for d in grid.days:
-                for b in range(1, grid.blocks_per_day + 1):
-                    for r in rooms:
-                        all_slots.append((d, b, r.id))
-            random.shuffle(all_slots)
-
-            used_room = set()            # {(day, block, room_id)}
-            used_inst = set()            # {(instructor_id, day, block)}
-            assigns = []
-
-            # 코스 순서도 매번 랜덤 → “항상 랜덤” 요구 반영
-            random_courses = courses_m[:]
-            random.shuffle(random_courses)
-
-            for c in random_courses:
-                for s_idx in range(max(1, c.sessions_per_week)):
-                    placed = False
-                    random.shuffle(all_slots)
-                    for (d, b, r_id) in all_slots:
-                        # 방 / 강사 충돌 방지
-                        if (d, b, r_id) in used_room:
-                            continue
-                        if (c.instructor_id, d, b) in used_inst:
-                            continue
-                        # 배정
-                        assigns.append({
-                            "course_id": c.id,
-                            "session_index": s_idx,
-                            "day": d,
-                            "block": b,
-                            "room_id": r_id
-                        })
-                        used_room.add((d, b, r_id))
-                        used_inst.add((c.instructor_id, d, b))
-                        placed = True
-                        break
-                    if not placed:
-                        continue  # 남은 슬롯 부족하면 해당 세션은 건너뜀
-
-        # 6) 프론트용 schedule 생성
-        by_cid = {str(r.get("교과목코드") or r.get("코드") or f"C{i+1}"): dict(r)
-                  for i, r in df.iterrows()}
-        schedule_rows = []
-        for a in assigns:
-            base = by_cid.get(str(a["course_id"]), {})
-            schedule_rows.append({
-                **base,
-                "요일": a["day"],
-                "slot": f"P{a['block']}",
-                "강의실": a["room_id"],
-            })
-
-        return {
-            "message": "배정 완료",
-            "summary": {
-                "courses": len(courses_m),
-                "rooms": len(rooms),
-                "instructors": len(instructors),
-                "days": grid.days,
-                "blocks_per_day": grid.blocks_per_day,
-                "block_minutes": grid.block_minutes
-            },
-            "solution": {"assignments": assigns},
-            "schedule": schedule_rows,
-        }
+        sol = await _solve_in_pool(courses_m, rooms, instructors, req)
+
+        return await run_in_threadpool(
+            _finish_schedule, version, courses_m, rooms, instructors, req.grid, sol
+        )
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={"detail": f"/schedule 실패: {e.__class__.__name__}: {e}"}
         )
@@ -0,0 +1,8 @@
+import os
+import sys
+from pathlib import Path
+
+# backend/를 import 경로에 추가해 `from app.main import ...` 가 동작하게 함
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+# 테스트는 실제 DB 대신 메모리 SQLite 사용
+os.environ.setdefault("DATABASE_URL", "sqlite://")
@@ -0,0 +1,94 @@
+import asyncio
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import app.main as main
+from app.core.scheduler import Course, Grid, Hard, Instructor, Request, Room, Soft
+from app.main import _coalesce_cols, _course_id_series, _to_int_series
+
+
+# ---------- _to_int_series: dtype별 변환 경로 ----------
+def test_to_int_series_int_dtype():
+    s = pd.Series([1, 2, 3])
+    assert _to_int_series(s, 30).tolist() == [1, 2, 3]
+
+
+def test_to_int_series_float_nan_and_inf_use_default():
+    s = pd.Series([30.0, np.nan, np.inf, -np.inf, 2.0])
+    assert _to_int_series(s, 7).tolist() == [30, 7, 7, 7, 2]
+
+
+def test_to_int_series_object_decimal_and_commas():
+    # "30.0"은 소수로 읽혀 30 (숫자만 남기면 300이 됨), "1,200"은 콤마 제거 후 1200
+    s = pd.Series(["30.0", "1,200", "45명", 12], dtype=object)
+    assert _to_int_series(s, 0).tolist() == [30, 1200, 45, 12]
+
+
+def test_to_int_series_object_dash_and_blank_use_default():
+    s = pd.Series(["-", "", "  ", None, "abc"], dtype=object)
+    assert _to_int_series(s, 1).tolist() == [1, 1, 1, 1, 1]
+
+
+# ---------- _coalesce_cols: 여러 컬럼 병합 ----------
+def test_coalesce_cols_picks_first_non_blank():
+    df = pd.DataFrame({
+        "수업주수": ["", None, "3", "  "],
+        "수업주수(회)": ["2", "4", "9", None],
+    })
+    out = _to_int_series(_coalesce_cols(df, ["수업주수", "수업주수(회)"]), 1)
+    assert out.tolist() == [2, 4, 3, 1]
+
+
+def test_coalesce_cols_zero_is_kept_not_fallen_back():
+    # 0은 값이 있는 것으로 보고 다음 컬럼으로 넘어가지 않음
+    df = pd.DataFrame({"수업주수": [0, np.nan], "수업주수(회)": [5, 6]})
+    out = _to_int_series(_coalesce_cols(df, ["수업주수", "수업주수(회)"]), 1)
+    assert out.tolist() == [0, 6]
+
+
+def test_coalesce_cols_missing_columns_use_fallback():
+    df = pd.DataFrame({"x": [1, 2]})
+    assert _coalesce_cols(df, ["교수"], "교수미정").tolist() == ["교수미정", "교수미정"]
+
+
+# ---------- _course_id_series ----------
+def test_course_id_series_blank_or_nan_ids_get_row_number():
+    df = pd.DataFrame({
+        "교과목코드": ["A1", np.nan, "", None],
+        "코드": [None, None, None, "B4"],
+    })
+    assert _course_id_series(df).tolist() == ["A1", "C2", "C3", "B4"]
+
+
+def test_course_id_series_without_id_columns():
+    df = pd.DataFrame({"교과목명": ["a", "b"]})
+    assert _course_id_series(df).tolist() == ["C1", "C2"]
+
+
+# ---------- 풀이 프로세스 풀 복구 ----------
+def _kill_self():
+    os.kill(os.getpid(), signal.SIGKILL)
+
+
+def test_solve_in_pool_replaces_broken_pool(monkeypatch):
+    broken = ProcessPoolExecutor(max_workers=1)
+    with pytest.raises(BrokenProcessPool):
+        broken.submit(_kill_self).result()
+    monkeypatch.setattr(main, "PROCESS_POOL", broken)
+
+    grid = Grid(days=["MON"], blocks_per_day=2)
+    req = Request(grid=grid, hard=Hard(), soft=Soft(), randomize=False)
+    courses = [Course(id="C1", name="과목1", instructor_id="I1")]
+    sol = asyncio.run(main._solve_in_pool(courses, [Room(id="R1", name="R1")],
+                                          [Instructor(id="I1", name="I1")], req))
+    try:
+        assert len(sol["assignments"]) == 1
+        assert main.PROCESS_POOL is not broken
+    finally:
+        main.PROCESS_POOL.shutdown()
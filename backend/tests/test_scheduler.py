@@ -0,0 +1,130 @@
+import random
+from collections import OrderedDict
+
+import pytest
+
+from ortools.sat.python import cp_model
+
+import app.core.scheduler as scheduler
+from app.core.scheduler import (
+    Course, Grid, Hard, Instructor, Request, Room, Soft, greedy_assign, solve
+)
+
+
+def _courses(n, n_inst):
+    return [Course(id=f"C{i}", name=f"과목{i}", sessions_per_week=1 + i % 3,
+                   instructor_id=f"I{i % n_inst}") for i in range(n)]
+
+
+def _assert_conflict_free(assigns, courses):
+    inst = {c.id: c.instructor_id for c in courses}
+    room_slots = [(a["day"], a["block"], a["room_id"]) for a in assigns]
+    inst_slots = [(a["day"], a["block"], inst[a["course_id"]]) for a in assigns]
+    sessions = [(a["course_id"], a["session_index"]) for a in assigns]
+    assert len(set(room_slots)) == len(room_slots)
+    assert len(set(inst_slots)) == len(inst_slots)
+    assert len(set(sessions)) == len(sessions)
+
+
+# ---------- 랜덤 그리디 ----------
+def test_greedy_assign_is_conflict_free_and_complete():
+    random.seed(0)
+    courses = _courses(40, 10)
+    rooms = [Room(id=f"R{i}", name=f"R{i}") for i in range(3)]
+    grid = Grid(days=["MON", "TUE", "WED", "THU", "FRI"], blocks_per_day=9)
+    assigns = greedy_assign(courses, rooms, grid)
+    _assert_conflict_free(assigns, courses)
+    # 슬롯이 충분하면 모든 세션이 배정됨
+    assert len(assigns) == sum(c.sessions_per_week for c in courses)
+    for a in assigns:
+        assert a["day"] in grid.days and 1 <= a["block"] <= grid.blocks_per_day
+
+
+def test_greedy_assign_skips_sessions_when_slots_run_out():
+    random.seed(1)
+    courses = _courses(10, 1)  # 강사 1명 → 슬롯 수만큼만 배정 가능
+    rooms = [Room(id="R1", name="R1"), Room(id="R2", name="R2")]
+    grid = Grid(days=["MON"], blocks_per_day=4)
+    assigns = greedy_assign(courses, rooms, grid)
+    _assert_conflict_free(assigns, courses)
+    assert len(assigns) == 4
+
+
+# ---------- 솔버: 동일 강의실 대칭 제거 ----------
+def test_solve_breaks_symmetry_between_identical_rooms():
+    random.seed(2)
+    grid = Grid(days=["MON", "TUE", "WED", "THU", "FRI"], blocks_per_day=4)
+    # R1/R2는 같은 그룹(수용인원·태그 동일), BIG은 별도 그룹
+    rooms = [Room(id="R1", name="R1", capacity=40), Room(id="R2", name="R2", capacity=40),
+             Room(id="BIG", name="BIG", capacity=100)]
+    instructors = [Instructor(id=f"I{k}", name=f"I{k}",
+                              unavailable=[("MON", 1), ("TUE", 2)] if k == 0 else [])
+                   for k in range(6)]
+    courses = [Course(id=f"C{i}", name=f"과목{i}", size=80 if i < 3 else 30,
+                      sessions_per_week=2, instructor_id=f"I{i % 6}") for i in range(18)]
+    req = Request(grid=grid, hard=Hard(no_friday_evening=True),
+                  soft=Soft(prefer_morning=True), randomize=False)
+
+    sol = solve(courses, rooms, instructors, req)
+    assert sol["status"] in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+    assigns = sol["assignments"]
+    _assert_conflict_free(assigns, courses)
+    assert len(assigns) == sum(c.sessions_per_week for c in courses)
+
+    by_course = {c.id: c for c in courses}
+    cap = {r.id: r.capacity for r in rooms}
+    unavail = {i.id: set(i.unavailable) for i in instructors}
+    used = {(a["day"], a["block"], a["room_id"]) for a in assigns}
+    for a in assigns:
+        c = by_course[a["course_id"]]
+        assert c.size <= cap[a["room_id"]]
+        assert (a["day"], a["block"]) not in unavail[c.instructor_id]
+        assert not (a["day"] == "FRI" and grid.is_evening(a["block"]))
+        # 같은 그룹에서 뒤 강의실(R2)은 앞 강의실(R1)이 쓰일 때만 사용
+        if a["room_id"] == "R2":
+            assert (a["day"], a["block"], "R1") in used
+
+
+# ---------- 솔버: 모델/해 캐시 ----------
+@pytest.fixture
+def build_calls(monkeypatch):
+    monkeypatch.setattr(scheduler, "_MODEL_CACHE", OrderedDict())
+    monkeypatch.setattr(scheduler, "_SOLUTION_CACHE", OrderedDict())
+    calls = []
+    build = scheduler._build_model
+
+    def counting_build(*args):
+        calls.append(args)
+        return build(*args)
+
+    monkeypatch.setattr(scheduler, "_build_model", counting_build)
+    return calls
+
+
+def _small_instance(randomize):
+    grid = Grid(days=["MON", "TUE"], blocks_per_day=3)
+    req = Request(grid=grid, hard=Hard(), soft=Soft(prefer_morning=True), randomize=randomize)
+    courses = _courses(4, 2)
+    rooms = [Room(id="R1", name="R1"), Room(id="R2", name="R2")]
+    instructors = [Instructor(id=f"I{k}", name=f"I{k}") for k in range(2)]
+    return courses, rooms, instructors, req
+
+
+def test_solve_reuses_model_and_solution_when_not_randomized(build_calls):
+    first = solve(*_small_instance(randomize=False))
+    second = solve(*_small_instance(randomize=False))
+    assert len(build_calls) == 1
+    assert second == first
+
+    # 해 캐시가 비어도 모델은 재사용
+    scheduler._SOLUTION_CACHE.clear()
+    third = solve(*_small_instance(randomize=False))
+    assert len(build_calls) == 1
+    assert len(third["assignments"]) == len(first["assignments"])
+
+
+def test_solve_rebuilds_model_when_randomized(build_calls):
+    solve(*_small_instance(randomize=True))
+    solve(*_small_instance(randomize=True))
+    assert len(build_calls) == 2
+    assert not scheduler._MODEL_CACHE and not scheduler._SOLUTION_CACHE
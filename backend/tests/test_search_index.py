@@ -0,0 +1,39 @@
+from sqlalchemy import create_engine, text
+
+from app.db.search_index import ensure_search_index
+
+
+def _match_count(engine, q):
+    with engine.connect() as c:
+        return c.execute(text("SELECT COUNT(*) FROM courses_fts WHERE courses_fts MATCH :q"),
+                         {"q": f'"{q}"'}).scalar()
+
+
+def _make_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'courses.db'}")
+    with engine.begin() as c:
+        c.execute(text('CREATE TABLE courses ("교과목명" TEXT)'))
+        c.execute(text("INSERT INTO courses VALUES ('IoT시스템개발')"))
+    return engine
+
+
+def test_startup_builds_missing_index_then_reuses_it(tmp_path):
+    engine = _make_engine(tmp_path)
+    assert ensure_search_index(engine) is True
+    assert _match_count(engine, "시스템") == 1
+
+    with engine.begin() as c:
+        c.execute(text("INSERT INTO courses VALUES ('운영시스템')"))
+    # 이미 있으면 재시작해도 재구축하지 않음
+    assert ensure_search_index(engine) is True
+    assert _match_count(engine, "시스템") == 1
+
+    # 적재 직후(rebuild=True)에만 다시 만듦
+    assert ensure_search_index(engine, rebuild=True) is True
+    assert _match_count(engine, "시스템") == 2
+
+
+def test_failure_returns_false_and_logs(tmp_path, caplog):
+    engine = create_engine(f"sqlite:///{tmp_path / 'empty.db'}")
+    assert ensure_search_index(engine) is False
+    assert "검색 인덱스 준비 실패" in caplog.text